@@ -7,16 +7,18 @@ Purpose: Learning tool for personal finance management
 Features: Transaction management, visualization, AI advisor
 """
 
+import atexit
 import csv
+import mmap
 import os
+import re
+import sys
 from datetime import datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
 import warnings
 
-# Data analysis and visualization libraries
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend for Replit
+# The visualization library (matplotlib) is imported inside
+# visualize_spending to keep startup fast
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
@@ -28,9 +30,33 @@ warnings.filterwarnings('ignore')
 # CSV file name for storing transactions
 CSV_FILE = "transactions.csv"
 
+# Encoding used for every read and write of the CSV file
+CSV_ENCODING = "utf-8"
+
 # Column headers for the CSV file
 CSV_HEADERS = ["Date", "Category", "Amount", "Description"]
 
+# Expected date format: YYYY-MM-DD with month 01-12 and day 01-31
+_DATE_RE = re.compile(r'\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])')
+
+# Expected amount format: plain decimal number with at most two decimal
+# places, e.g. 12, 12.5 or .50
+_AMOUNT_RE = re.compile(r'-?(\d+(\.\d{0,2})?|\.\d{1,2})')
+
+# Row templates for the transaction table and category breakdown
+_TRANSACTION_ROW = "{:<5} {:<12} {:<15} ${:<9.2f} {:<30}".format
+_CATEGORY_ROW = "{:<20} ${:<14.2f} {:>5.1f}%".format
+
+# Chart figure reused across visualize_spending calls
+_fig = None
+
+# Append handle kept open for the whole session (opened by initialize_csv)
+_csv_fh = None
+_csv_writer = None
+
+# Running (sum in cents, count) per category, kept up to date as transactions are added
+_totals: dict[str, tuple[int, int]] = {}
+
 
 # ============================================================================
 # CSV FILE MANAGEMENT FUNCTIONS
@@ -41,13 +67,100 @@ def initialize_csv():
     Creates the CSV file with headers if it doesn't exist.
     This ensures the application can run without any setup.
     """
-    if not os.path.exists(CSV_FILE):
-        with open(CSV_FILE, mode='w', newline='') as file:
+    # Create the file atomically; fails if it already exists
+    try:
+        fd = os.open(CSV_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        print(f"✓ Found existing transactions file: {CSV_FILE}")
+    else:
+        with os.fdopen(fd, mode='w', newline='', encoding=CSV_ENCODING) as file:
             writer = csv.writer(file)
             writer.writerow(CSV_HEADERS)
         print(f"✓ Created new transactions file: {CSV_FILE}")
-    else:
-        print(f"✓ Found existing transactions file: {CSV_FILE}")
+    
+    # Open one line-buffered append handle for the rest of the session
+    global _csv_fh, _csv_writer
+    _csv_fh = open(CSV_FILE, mode='a', newline='', buffering=1,
+                   encoding=CSV_ENCODING)
+    _csv_writer = csv.writer(_csv_fh)
+    atexit.register(_close_csv)
+
+
+def _close_csv():
+    """
+    Flushes new transactions to disk and closes the append handle on exit.
+    """
+    if _csv_fh is not None and not _csv_fh.closed:
+        _csv_fh.flush()
+        os.fsync(_csv_fh.fileno())
+        _csv_fh.close()
+
+
+def load_totals():
+    """
+    Builds the per-category running totals by streaming the CSV once.
+    Called at startup; add_transaction keeps the totals current afterwards.
+    Rows rejected by _parse_row are skipped.
+    Returns the number of skipped rows.
+    """
+    _totals.clear()
+    skipped = 0
+    with open(CSV_FILE, mode='r', newline='', encoding=CSV_ENCODING,
+              errors='replace') as file:
+        reader = csv.reader(file)
+        next(reader, None)  # Skip header row
+        for row in reader:
+            if not row:
+                continue
+            parsed = _parse_row(row)
+            if parsed is None:
+                skipped += 1
+                continue
+            _, category, cents, _ = parsed
+            s, c = _totals.get(category, (0, 0))
+            _totals[category] = (s + cents, c + 1)
+    return skipped
+
+
+def _to_cents(amount):
+    """
+    Converts a dollar amount (number or CSV text) to integer cents,
+    rounding half-cents up. Totals are kept in cents so sums are exact.
+    """
+    cents = Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    return int(cents * 100)
+
+
+def _parse_row(row):
+    """
+    Validates one CSV row and returns (date, category, cents, description),
+    or None if the row does not have four fields, has an empty category or
+    its amount is unreadable. Every screen uses this rule so they all agree
+    on which rows count.
+    """
+    if len(row) != len(CSV_HEADERS):
+        return None
+    date, category, amount, description = row
+    if not category.strip():
+        return None
+    try:
+        cents = _to_cents(amount)
+    except (ValueError, InvalidOperation):
+        return None
+    return date, category, cents, description
+
+
+def _overall_totals():
+    """
+    Returns (total spending in cents, transaction count) across all
+    categories in a single pass over the running totals.
+    """
+    total_cents = 0
+    total_count = 0
+    for s, c in _totals.values():
+        total_cents += s
+        total_count += c
+    return total_cents, total_count
 
 
 def add_transaction():
@@ -66,10 +179,9 @@ def add_transaction():
         transaction_date = datetime.now().strftime("%Y-%m-%d")
     else:
         # Basic date validation
-        try:
-            datetime.strptime(date_input, "%Y-%m-%d")
+        if _DATE_RE.fullmatch(date_input):
             transaction_date = date_input
-        except ValueError:
+        else:
             print("❌ Invalid date format. Using today's date.")
             transaction_date = datetime.now().strftime("%Y-%m-%d")
     
@@ -82,14 +194,14 @@ def add_transaction():
     # Get amount with validation
     while True:
         amount_input = input("Enter amount ($): ").strip()
-        try:
-            amount = float(amount_input)
-            if amount <= 0:
-                print("❌ Amount must be greater than 0. Try again.")
-                continue
-            break
-        except ValueError:
-            print("❌ Invalid amount. Please enter a number.")
+        if not _AMOUNT_RE.fullmatch(amount_input):
+            print("❌ Invalid amount. Please enter a number with up to 2 decimal places.")
+            continue
+        amount_cents = _to_cents(amount_input)
+        if amount_cents <= 0:
+            print("❌ Amount must be greater than 0. Try again.")
+            continue
+        break
     
     # Get description
     description = input("Enter description: ").strip()
@@ -97,9 +209,12 @@ def add_transaction():
         description = "No description"
     
     # Write to CSV file
-    with open(CSV_FILE, mode='a', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow([transaction_date, category, amount, description])
+    amount = amount_cents / 100
+    _csv_writer.writerow([transaction_date, category, f"{amount:.2f}", description])
+    
+    # Update running totals for this category
+    s, c = _totals.get(category, (0, 0))
+    _totals[category] = (s + amount_cents, c + 1)
     
     print(f"\n✓ Transaction added successfully!")
     print(f"  Date: {transaction_date}")
@@ -108,6 +223,23 @@ def add_transaction():
     print(f"  Description: {description}")
 
 
+def _read_data_lines():
+    """
+    Yields the non-blank data lines of the CSV (header skipped) as bytes,
+    reading the file through a memory map instead of a buffered text stream.
+    """
+    with open(CSV_FILE, mode='rb') as file:
+        # mmap cannot map a 0-byte file; treat it as having no rows
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            mm.readline()  # Skip header row
+            for raw in iter(mm.readline, b''):
+                raw = raw.rstrip(b'\r\n')
+                if raw:
+                    yield raw
+
+
 def view_transactions():
     """
     Displays all transactions from the CSV file in a formatted table.
@@ -117,35 +249,45 @@ def view_transactions():
     print("ALL TRANSACTIONS")
     print("="*50)
     
-    # Read transactions from CSV
-    transactions = []
-    with open(CSV_FILE, mode='r') as file:
-        reader = csv.DictReader(file)
-        transactions = list(reader)
+    # Format each valid row from the CSV into a table line
+    lines = []
+    skipped = 0
+    for raw in _read_data_lines():
+        line = raw.decode(CSV_ENCODING, errors='replace')
+        
+        # csv.writer only quotes fields containing commas or quotes,
+        # so plain rows can be split directly
+        if b'"' in raw:
+            row = next(csv.reader([line]))
+        else:
+            row = line.split(',')
+        
+        parsed = _parse_row(row)
+        if parsed is None:
+            skipped += 1
+            continue
+        date, category, cents, description = parsed
+        
+        # Truncate description if too long
+        if len(description) > 27:
+            description = description[:27] + "..."
+        
+        lines.append(_TRANSACTION_ROW(len(lines) + 1, date, category, cents / 100, description))
+    
+    if skipped:
+        print(f"\n⚠️ Skipped {skipped} malformed row(s) in {CSV_FILE}")
     
     # Check if there are any transactions
-    if len(transactions) == 0:
+    if not lines:
         print("\n📭 No transactions found. Add your first transaction!")
         return
     
     # Display transactions in a formatted table
     print(f"\n{'No.':<5} {'Date':<12} {'Category':<15} {'Amount':<10} {'Description':<30}")
     print("-" * 80)
-    
-    for idx, transaction in enumerate(transactions, 1):
-        date = transaction['Date']
-        category = transaction['Category']
-        amount = float(transaction['Amount'])
-        description = transaction['Description']
-        
-        # Truncate description if too long
-        if len(description) > 27:
-            description = description[:27] + "..."
-        
-        print(f"{idx:<5} {date:<12} {category:<15} ${amount:<9.2f} {description:<30}")
-    
+    sys.stdout.write("\n".join(lines) + "\n")
     print("-" * 80)
-    print(f"Total transactions: {len(transactions)}")
+    print(f"Total transactions: {len(lines)}")
 
 
 # ============================================================================
@@ -164,35 +306,29 @@ def spending_summary():
     print("SPENDING SUMMARY")
     print("="*50)
     
-    # Load transactions using pandas for easier analysis
-    try:
-        df = pd.read_csv(CSV_FILE)
-    except pd.errors.EmptyDataError:
-        print("\n📭 No transactions found. Add some transactions first!")
-        return
-    
-    # Check if dataframe is empty
-    if df.empty or len(df) == 0:
+    # Check if there are any transactions
+    if not _totals:
         print("\n📭 No transactions found. Add some transactions first!")
         return
     
-    # Calculate total spending
-    total_spending = df['Amount'].sum()
+    # Calculate category-wise spending from the running totals
+    category_summary = sorted(_totals.items(), key=lambda item: item[1][0], reverse=True)
     
-    # Calculate category-wise spending
-    category_summary = df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
+    # Calculate total spending and transaction count
+    total_cents, total_count = _overall_totals()
+    total_spending = total_cents / 100
     
     # Calculate average transaction
-    avg_transaction = df['Amount'].mean()
+    avg_transaction = total_spending / total_count
     
     # Find highest spending category
-    top_category = category_summary.index[0] if len(category_summary) > 0 else "N/A"
+    top_category = category_summary[0][0]
     
     # Display summary
     print(f"\n💰 Total Spending: ${total_spending:.2f}")
     print(f"📊 Average Transaction: ${avg_transaction:.2f}")
     print(f"🔝 Top Category: {top_category}")
-    print(f"📝 Total Transactions: {len(df)}")
+    print(f"📝 Total Transactions: {total_count}")
     
     print("\n" + "-"*50)
     print("CATEGORY-WISE BREAKDOWN")
@@ -200,9 +336,13 @@ def spending_summary():
     print(f"{'Category':<20} {'Amount':<15} {'Percentage':<10}")
     print("-"*50)
     
-    for category, amount in category_summary.items():
-        percentage = (amount / total_spending) * 100
-        print(f"{category:<20} ${amount:<14.2f} {percentage:>5.1f}%")
+    # Compute the percentage scale once rather than dividing per category
+    # (all-zero amounts show 0.0% rather than dividing by zero)
+    scale = 100 / total_cents if total_cents else 0.0
+    sys.stdout.write("\n".join(
+        _CATEGORY_ROW(category, cents / 100, cents * scale)
+        for category, (cents, _) in category_summary
+    ) + "\n")
     
     print("-"*50)
 
@@ -222,33 +362,40 @@ def visualize_spending():
     print("SPENDING VISUALIZATION")
     print("="*50)
     
-    # Load transactions
-    try:
-        df = pd.read_csv(CSV_FILE)
-    except pd.errors.EmptyDataError:
-        print("\n📭 No transactions found. Add some transactions first!")
-        return
-    
-    if df.empty or len(df) == 0:
+    if not _totals:
         print("\n📭 No transactions found. Add some transactions first!")
         return
     
-    # Calculate category-wise spending
-    category_spending = df.groupby('Category')['Amount'].sum()
-    
-    # Create figure with two subplots (pie chart and bar chart)
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend for Replit
+    import matplotlib.pyplot as plt
+    
+    # Calculate category-wise spending from the running totals, so the
+    # chart uses the same cents as the summary and advisor
+    category_spending = sorted(_totals.items(), key=lambda item: item[1][0], reverse=True)
+    categories = [category for category, _ in category_spending]
+    amounts = [cents / 100 for _, (cents, _) in category_spending]
+    
+    # Create figure with two subplots (pie chart and bar chart) on first use,
+    # afterwards clear and redraw the same axes
+    global _fig
+    if _fig is None:
+        _fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    else:
+        ax1, ax2 = _fig.axes
+        ax1.clear()
+        ax2.clear()
     
     # 1. PIE CHART
     # Shows percentage distribution of spending across categories
     colors = plt.cm.Set3(range(len(category_spending)))
-    ax1.pie(category_spending, labels=category_spending.index, autopct='%1.1f%%',
+    ax1.pie(amounts, labels=categories, autopct='%1.1f%%',
             colors=colors, startangle=90)
     ax1.set_title('Spending Distribution by Category', fontsize=14, fontweight='bold')
     
     # 2. BAR CHART
     # Shows actual amounts spent in each category
-    bars = ax2.bar(category_spending.index, category_spending.values, color=colors)
+    bars = ax2.bar(categories, amounts, color=colors)
     ax2.set_xlabel('Category', fontsize=12)
     ax2.set_ylabel('Amount ($)', fontsize=12)
     ax2.set_title('Spending by Category', fontsize=14, fontweight='bold')
@@ -260,12 +407,11 @@ def visualize_spending():
         ax2.text(bar.get_x() + bar.get_width()/2., height,
                 f'${height:.2f}', ha='center', va='bottom', fontsize=9)
     
-    plt.tight_layout()
+    _fig.tight_layout()
     
     # Save the chart
     chart_filename = 'spending_chart.png'
-    plt.savefig(chart_filename, dpi=100, bbox_inches='tight')
-    plt.close()
+    _fig.savefig(chart_filename, dpi=100, bbox_inches='tight')
     
     print(f"\n✓ Visualization created successfully!")
     print(f"📊 Chart saved as: {chart_filename}")
@@ -276,6 +422,55 @@ def visualize_spending():
 # AI ADVISOR FUNCTION
 # ============================================================================
 
+# Money-saving tips for each known category, built once at import time
+_TIPS: dict[str, tuple[str, ...]] = {
+    'Food': (
+        "🍳 Cook at home more often - can save up to 60% compared to eating out",
+        "📝 Plan your meals weekly to reduce impulse purchases",
+        "🛒 Buy groceries in bulk for non-perishable items",
+        "💧 Drink water instead of beverages when dining out"
+    ),
+    'Transport': (
+        "🚌 Consider public transport or carpooling to reduce costs",
+        "🚴 Use bike or walk for short distances - good for health too!",
+        "⛽ Maintain your vehicle regularly to improve fuel efficiency",
+        "📱 Use ride-sharing apps to compare prices before booking"
+    ),
+    'Shopping': (
+        "🛍️ Wait 24 hours before making non-essential purchases",
+        "💳 Use cashback and rewards programs",
+        "🏷️ Compare prices online before buying",
+        "📅 Shop during sales and use discount codes"
+    ),
+    'Entertainment': (
+        "📺 Consider sharing streaming subscriptions with family",
+        "🎮 Look for free or low-cost entertainment alternatives",
+        "🎟️ Use student/senior discounts if applicable",
+        "🏠 Host game nights at home instead of going out"
+    ),
+    'Bills': (
+        "💡 Switch to energy-efficient appliances to lower electricity bills",
+        "📞 Review and negotiate your subscription services annually",
+        "🌡️ Adjust thermostat settings to save on heating/cooling",
+        "📊 Track usage patterns to identify saving opportunities"
+    ),
+    'Healthcare': (
+        "💊 Ask for generic medications when possible",
+        "🏥 Use preventive care to avoid costly treatments",
+        "💰 Check if your insurance covers wellness programs",
+        "🔍 Compare prices at different pharmacies"
+    )
+}
+
+# Tips used when the dominant category has no specific advice
+_DEFAULT_TIPS = (
+    "📊 Track your expenses regularly to identify patterns",
+    "💰 Set a monthly budget for this category",
+    "🎯 Try to reduce spending by 10-15% next month",
+    "📱 Use apps to find better deals and discounts"
+)
+
+
 def ai_advisor():
     """
     AI-powered financial advisor that analyzes spending patterns
@@ -290,23 +485,16 @@ def ai_advisor():
     print("AI FINANCIAL ADVISOR")
     print("="*50)
     
-    # Load transactions
-    try:
-        df = pd.read_csv(CSV_FILE)
-    except pd.errors.EmptyDataError:
-        print("\n📭 No transactions found. Add some transactions first!")
-        return
-    
-    if df.empty or len(df) == 0:
+    if not _totals:
         print("\n📭 No transactions found. Add some transactions first!")
         return
     
     # Analyze spending patterns
-    category_spending = df.groupby('Category')['Amount'].sum().sort_values(ascending=False)
-    top_category = category_spending.index[0]
-    top_amount = category_spending.values[0]
-    total_spending = df['Amount'].sum()
-    top_percentage = (top_amount / total_spending) * 100
+    # Only the top category is needed, so a single max() scan is enough
+    top_category, (top_cents, _) = max(_totals.items(), key=lambda item: item[1][0])
+    total_cents, _ = _overall_totals()
+    top_amount = top_cents / 100
+    top_percentage = (top_cents / total_cents) * 100 if total_cents else 0.0
     
     print(f"\n🤖 AI Analysis Complete!")
     print(f"\n📊 Your dominant spending category: {top_category}")
@@ -316,52 +504,8 @@ def ai_advisor():
     print("\n💡 PERSONALIZED MONEY-SAVING TIPS:")
     print("-" * 50)
     
-    tips = {
-        'Food': [
-            "🍳 Cook at home more often - can save up to 60% compared to eating out",
-            "📝 Plan your meals weekly to reduce impulse purchases",
-            "🛒 Buy groceries in bulk for non-perishable items",
-            "💧 Drink water instead of beverages when dining out"
-        ],
-        'Transport': [
-            "🚌 Consider public transport or carpooling to reduce costs",
-            "🚴 Use bike or walk for short distances - good for health too!",
-            "⛽ Maintain your vehicle regularly to improve fuel efficiency",
-            "📱 Use ride-sharing apps to compare prices before booking"
-        ],
-        'Shopping': [
-            "🛍️ Wait 24 hours before making non-essential purchases",
-            "💳 Use cashback and rewards programs",
-            "🏷️ Compare prices online before buying",
-            "📅 Shop during sales and use discount codes"
-        ],
-        'Entertainment': [
-            "📺 Consider sharing streaming subscriptions with family",
-            "🎮 Look for free or low-cost entertainment alternatives",
-            "🎟️ Use student/senior discounts if applicable",
-            "🏠 Host game nights at home instead of going out"
-        ],
-        'Bills': [
-            "💡 Switch to energy-efficient appliances to lower electricity bills",
-            "📞 Review and negotiate your subscription services annually",
-            "🌡️ Adjust thermostat settings to save on heating/cooling",
-            "📊 Track usage patterns to identify saving opportunities"
-        ],
-        'Healthcare': [
-            "💊 Ask for generic medications when possible",
-            "🏥 Use preventive care to avoid costly treatments",
-            "💰 Check if your insurance covers wellness programs",
-            "🔍 Compare prices at different pharmacies"
-        ]
-    }
-    
     # Get tips for the dominant category
-    category_tips = tips.get(top_category, [
-        "📊 Track your expenses regularly to identify patterns",
-        "💰 Set a monthly budget for this category",
-        "🎯 Try to reduce spending by 10-15% next month",
-        "📱 Use apps to find better deals and discounts"
-    ])
+    category_tips = _TIPS.get(top_category, _DEFAULT_TIPS)
     
     for i, tip in enumerate(category_tips, 1):
         print(f"{i}. {tip}")
@@ -376,20 +520,42 @@ def ai_advisor():
 # MAIN MENU AND APPLICATION FLOW
 # ============================================================================
 
+# Banners are built once at import time and written with a single call
+_WELCOME_BANNER = (
+    "\n" + "="*60 + "\n"
+    "🎯 WELCOME TO PERSONAL FINANCE TRACKER WITH AI!\n"
+    + "="*60 + "\n"
+    "Track expenses • Get AI insights • Manage your money\n"
+    + "="*60 + "\n\n"
+)
+
+_MENU = (
+    "\n" + "="*50 + "\n"
+    "PERSONAL FINANCE TRACKER WITH AI\n"
+    + "="*50 + "\n"
+    "1. Add New Transaction\n"
+    "2. View All Transactions\n"
+    "3. Spending Summary\n"
+    "4. Visualize Spending (Charts)\n"
+    "5. AI Financial Advisor\n"
+    "6. Exit\n"
+    + "="*50 + "\n"
+)
+
+_EXIT_BANNER = (
+    "\n" + "="*50 + "\n"
+    "👋 Thank you for using Finance Tracker!\n"
+    "Stay financially smart! 💰\n"
+    + "="*50 + "\n\n"
+)
+
+
 def display_menu():
     """
     Displays the main menu options for the user.
     """
-    print("\n" + "="*50)
-    print("PERSONAL FINANCE TRACKER WITH AI")
-    print("="*50)
-    print("1. Add New Transaction")
-    print("2. View All Transactions")
-    print("3. Spending Summary")
-    print("4. Visualize Spending (Charts)")
-    print("5. AI Financial Advisor")
-    print("6. Exit")
-    print("="*50)
+    sys.stdout.write(_MENU)
+    sys.stdout.flush()
 
 
 def main():
@@ -397,14 +563,13 @@ def main():
     Main function that runs the application.
     Handles menu selection and program flow.
     """
-    print("\n" + "="*60)
-    print("🎯 WELCOME TO PERSONAL FINANCE TRACKER WITH AI!")
-    print("="*60)
-    print("Track expenses • Get AI insights • Manage your money")
-    print("="*60 + "\n")
+    sys.stdout.write(_WELCOME_BANNER)
     
     # Initialize CSV file
     initialize_csv()
+    skipped = load_totals()
+    if skipped:
+        print(f"⚠️ Skipped {skipped} malformed row(s) in {CSV_FILE}")
     
     # Main application loop
     while True:
@@ -422,10 +587,7 @@ def main():
         elif choice == "5":
             ai_advisor()
         elif choice == "6":
-            print("\n" + "="*50)
-            print("👋 Thank you for using Finance Tracker!")
-            print("Stay financially smart! 💰")
-            print("="*50 + "\n")
+            sys.stdout.write(_EXIT_BANNER)
             break
         else:
             print("\n❌ Invalid choice. Please enter a number between 1-6.")